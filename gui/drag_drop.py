@@ -3,37 +3,84 @@ Drag and Drop Components
 Custom widgets that support file drag and drop
 """
 
-from PyQt5.QtWidgets import QLineEdit
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QDragEnterEvent, QDropEvent
+from PyQt5.QtWidgets import QListView, QAbstractItemView
+from PyQt5.QtCore import Qt, QStringListModel, pyqtSignal
+from PyQt5.QtGui import QDragEnterEvent, QDragMoveEvent, QDropEvent, QPainter, QPalette
 
-class DragDropLineEdit(QLineEdit):
-    """Custom QLineEdit that accepts drag and drop of files and folders."""
+class DragDropListView(QListView):
+    """Custom QListView that accepts drag and drop of files and folders."""
+    
+    # Emitted with the full list of paths whenever they change
+    pathsDropped = pyqtSignal(list)
     
     def __init__(self, parent=None):
-        """Initialize the drag and drop line edit."""
+        """Initialize the drag and drop list view."""
         super().__init__(parent)
         self.setAcceptDrops(True)
-        self.paths = []
+        self.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        # Model-backed list: only visible rows are laid out and painted,
+        # however many paths are dropped
+        self.setModel(QStringListModel(self))
+        self.placeholder_text = ""
+
+    def setPlaceholderText(self, text):
+        """Set the hint shown while no paths have been added."""
+        self.placeholder_text = text
+        self.viewport().update()
         
     def dragEnterEvent(self, event: QDragEnterEvent):
-        """Handle drag enter events for the line edit."""
+        """Handle drag enter events for the list view."""
+        if event.mimeData().hasUrls():
+            event.acceptProposedAction()
+
+    def dragMoveEvent(self, event: QDragMoveEvent):
+        """Keep accepting file drags while they move over the list view."""
         if event.mimeData().hasUrls():
             event.acceptProposedAction()
         
     def dropEvent(self, event: QDropEvent):
-        """Handle drop events for the line edit."""
-        self.paths = []
-        paths_text = []
+        """Handle drop events for the list view."""
+        urls = event.mimeData().urls()
+        self.add_paths([url.toLocalFile() for url in urls if url.isLocalFile()])
+        event.acceptProposedAction()
+
+    def add_paths(self, paths):
+        """Append paths that are not in the list yet and notify listeners."""
+        model = self.model()
+        existing = set(model.stringList())
         
-        for url in event.mimeData().urls():
-            path = url.toLocalFile()
-            self.paths.append(path)
-            paths_text.append(path)
+        # dict.fromkeys drops repeated paths but keeps their order
+        new_paths = [path for path in dict.fromkeys(paths) if path and path not in existing]
+        if not new_paths:
+            return
             
-        self.setText("; ".join(paths_text))
-        event.acceptProposedAction()
+        row = model.rowCount()
+        model.insertRows(row, len(new_paths))
+        for offset, path in enumerate(new_paths):
+            model.setData(model.index(row + offset), path)
+            
+        self.pathsDropped.emit(self.get_paths())
+
+    def remove_selected_paths(self):
+        """Remove the selected paths and notify listeners."""
+        rows = sorted((index.row() for index in self.selectedIndexes()), reverse=True)
+        if not rows:
+            return
+            
+        for row in rows:
+            self.model().removeRows(row, 1)
+            
+        self.pathsDropped.emit(self.get_paths())
 
     def get_paths(self):
         """Return the list of dropped paths."""
-        return self.paths 
\ No newline at end of file
+        return self.model().stringList()
+
+    def paintEvent(self, event):
+        """Paint the list, or the placeholder hint while it is empty."""
+        super().paintEvent(event)
+        if self.model().rowCount() == 0 and self.placeholder_text:
+            painter = QPainter(self.viewport())
+            painter.setPen(self.palette().color(QPalette.PlaceholderText))
+            painter.drawText(self.viewport().rect(), Qt.AlignCenter | Qt.TextWordWrap, self.placeholder_text)
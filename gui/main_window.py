@@ -4,16 +4,119 @@ Defines the UI components and application logic
 """
 
 import os
+import re
+import shutil
+import sys
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache, partial
+from pathlib import Path
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                             QHBoxLayout, QPushButton, QLabel, QProgressBar, 
                             QCheckBox, QFileDialog, QMessageBox, QComboBox, 
                             QListWidget, QGroupBox, QTabWidget, QRadioButton, 
-                            QGridLayout, QLineEdit, QListWidgetItem)
-from PyQt5.QtCore import Qt
+                            QGridLayout, QLineEdit, QListWidgetItem, QButtonGroup)
+from PyQt5.QtCore import Qt, QTimer, QStandardPaths
+from PyQt5.QtGui import QColor, QPalette
 
-from gui.drag_drop import DragDropLineEdit
-from processors.html_processor import process_html_file
-from utils.file_utils import get_all_files
+from gui.drag_drop import DragDropListView
+from gui.workers import ProcessSignals, ProgressCounter, FileScanner, report_chunk, report_prune
+from processors.batch import process_chunk, prune_cache
+
+STYLES_DIR = Path(__file__).with_name("styles")
+
+# Size the result cache is pruned back to, least recently used results first
+CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# Extensions to scan for, keyed by the (HTML, Text) checkbox states
+EXTENSIONS_BY_FILE_TYPES = {
+    (True, False): ('.html',),
+    (False, True): ('.txt',),
+    (True, True): ('.html', '.txt'),
+}
+
+# Tags offered as checkboxes on the removal and attribute cleaning tabs
+COMMON_REMOVAL_TAGS = ("script", "style", "iframe", "comment", "header", "footer", "nav", "aside")
+COMMON_CLEAN_TAGS = ("p", "div", "span", "a", "table", "tr", "td", "img", "h1", "h2", "h3", "ul", "ol", "li")
+
+# Tag names in user input, including namespaced ones such as o:p or svg:rect;
+# anything else (commas, spaces, angle brackets, dots) separates them
+TAG_NAME_RE = re.compile(r"[A-Za-z][\w:-]*")
+
+def _cache_dir():
+    """
+    Return the folder for cached results, following the platform's conventions.
+    
+    Returns:
+        str: Path of the folder, which may not exist yet
+        
+    Raises:
+        OSError: If the platform has no writable cache location
+    """
+    location = QStandardPaths.writableLocation(QStandardPaths.CacheLocation)
+    if not location:
+        raise OSError("No writable cache location")
+    return os.path.join(location, "results")
+
+# Number of files processed by each worker process job
+JOB_CHUNK_SIZE = 16
+
+# Number of error messages listed in the end-of-run error dialog
+MAX_REPORTED_ERRORS = 10
+
+@lru_cache(maxsize=None)
+def _load_stylesheet(name):
+    """Read a QSS file from the styles directory, once per process."""
+    return (STYLES_DIR / name).read_text(encoding='utf-8')
+
+# Colours substituted into the styles/theme.qss template for each theme
+DARK_THEME_COLORS = {
+    'input_border': '#333',
+    'frame_border': '#444',
+    'tab_bg': '#333',
+    'tab_selected_fg': '#ddd',
+}
+LIGHT_THEME_COLORS = {
+    'input_border': '#ddd',
+    'frame_border': '#ddd',
+    'tab_bg': '#eee',
+    'tab_selected_fg': 'white',
+}
+
+@lru_cache(maxsize=None)
+def _theme_stylesheet(dark):
+    """Return the stylesheet template filled in with the theme's colours."""
+    return _load_stylesheet("theme.qss") % (DARK_THEME_COLORS if dark else LIGHT_THEME_COLORS)
+
+@lru_cache(maxsize=None)
+def _dark_palette():
+    """Build the palette carrying the dark theme's generic colours, once per process."""
+    palette = QPalette()
+    for role, color in ((QPalette.Window, "#1e1e1e"),
+                        (QPalette.WindowText, "#ddd"),
+                        (QPalette.Base, "#2d2d2d"),
+                        (QPalette.AlternateBase, "#333"),
+                        (QPalette.Text, "#ddd"),
+                        (QPalette.Button, "#2d2d2d"),
+                        (QPalette.ButtonText, "#ddd"),
+                        (QPalette.PlaceholderText, "#888")):
+        palette.setColor(role, QColor(color))
+    for role in (QPalette.WindowText, QPalette.Text, QPalette.ButtonText):
+        palette.setColor(QPalette.Disabled, role, QColor("#777"))
+    return palette
+
+def _detect_dark_mode():
+    """Return whether the system theme is dark, cached on the QApplication."""
+    app = QApplication.instance()
+    if not hasattr(app, '_is_dark_mode'):
+        # Detect again on the next call if the system palette changes at runtime
+        app.paletteChanged.connect(lambda palette: setattr(app, '_is_dark_mode', None))
+        app._is_dark_mode = None
+        
+    if app._is_dark_mode is None:
+        app._is_dark_mode = app.palette().window().color().lightness() < 128
+    return app._is_dark_mode
 
 class FileProcessorWindow(QMainWindow):
     def __init__(self):
@@ -24,150 +127,58 @@ class FileProcessorWindow(QMainWindow):
         # Add author info label
         self.author_label = QLabel("© 2024 Piotr Proszowski")
         self.author_label.setAlignment(Qt.AlignRight)
-        self.author_label.setStyleSheet("color: #666666; padding: 5px;")
+        self.author_label.setObjectName("authorLabel")
+        
+        # Signals and counter shared by all processing jobs of a batch
+        self.process_signals = ProcessSignals(self)
+        self.process_signals.error.connect(self._collect_error, Qt.QueuedConnection)
+        self.run_errors = []
+        self.progress_counter = ProgressCounter()
+        
+        # Refresh progress every 100 ms instead of once per file
+        self.progress_timer = QTimer(self)
+        self.progress_timer.setInterval(100)
+        self.progress_timer.timeout.connect(self._flush_progress)
+        
+        # File dialog, created on the first Browse click and reused afterwards
+        self.browse_dialog = None
+        
+        # Worker processes, started on the first run and kept for later runs
+        self.executor = None
+        self.scanner = None
         
         # Detect system theme
-        app = QApplication.instance()
-        self.is_dark_mode = app.palette().window().color().lightness() < 128
+        self.is_dark_mode = _detect_dark_mode()
         
         # Set theme-dependent styles
         self._setup_styles()
         
-        # Create UI components
+        # Create UI components without intermediate repaints
+        self.setUpdatesEnabled(False)
         self._create_ui()
+        self.setUpdatesEnabled(True)
         
+        # Polish the finished widget tree in one pass before it is measured
+        self.ensurePolished()
         self.adjustSize()  # Dostosuj rozmiar okna do zawartości
 
     def _setup_styles(self):
         """Set up application styles based on theme."""
+        app = QApplication.instance()
+        
+        # Generic colours go through the palette, which propagates to every
+        # widget without a stylesheet selector walk
         if self.is_dark_mode:
-            self.setStyleSheet("""
-                QMainWindow {
-                    background-color: #1e1e1e;
-                }
-                QPushButton {
-                    background-color: #4CAF50;
-                    color: white;
-                    padding: 8px 15px;
-                    border-radius: 4px;
-                    min-width: 80px;
-                    border: none;
-                }
-                QPushButton:hover {
-                    background-color: #45a049;
-                }
-                QLineEdit {
-                    padding: 8px;
-                    border: 1px solid #333;
-                    border-radius: 4px;
-                    background-color: #2d2d2d;
-                    color: #ddd;
-                }
-                QCheckBox, QRadioButton, QLabel {
-                    color: #ddd;
-                }
-                QGroupBox {
-                    border: 1px solid #444;
-                    border-radius: 4px;
-                    margin-top: 1em;
-                    padding-top: 10px;
-                    color: #ddd;
-                }
-                QGroupBox::title {
-                    subcontrol-origin: margin;
-                    left: 10px;
-                    padding: 0 3px 0 3px;
-                }
-                QListWidget {
-                    background-color: #2d2d2d;
-                    border: 1px solid #333;
-                    color: #ddd;
-                }
-                QTabWidget::pane {
-                    border: 1px solid #444;
-                    background-color: #1e1e1e;
-                }
-                QTabBar::tab {
-                    background-color: #333;
-                    color: #ddd;
-                    padding: 8px 12px;
-                    margin-right: 2px;
-                }
-                QTabBar::tab:selected {
-                    background-color: #4CAF50;
-                }
-                QComboBox {
-                    background-color: #2d2d2d;
-                    color: #ddd;
-                    padding: 5px;
-                    border: 1px solid #333;
-                    border-radius: 4px;
-                }
-                QProgressBar {
-                    border: 1px solid #333;
-                    border-radius: 4px;
-                    text-align: center;
-                    background-color: #2d2d2d;
-                }
-                QProgressBar::chunk {
-                    background-color: #4CAF50;
-                    width: 1px;
-                }
-            """)
-        else:
-            self.setStyleSheet("""
-                QPushButton {
-                    background-color: #4CAF50;
-                    color: white;
-                    padding: 8px 15px;
-                    border-radius: 4px;
-                    min-width: 80px;
-                    border: none;
-                }
-                QPushButton:hover {
-                    background-color: #45a049;
-                }
-                QLineEdit {
-                    padding: 8px;
-                    border: 1px solid #ddd;
-                    border-radius: 4px;
-                }
-                QGroupBox {
-                    border: 1px solid #ddd;
-                    border-radius: 4px;
-                    margin-top: 1em;
-                    padding-top: 10px;
-                }
-                QGroupBox::title {
-                    subcontrol-origin: margin;
-                    left: 10px;
-                    padding: 0 3px 0 3px;
-                }
-                QListWidget {
-                    border: 1px solid #ddd;
-                }
-                QTabWidget::pane {
-                    border: 1px solid #ddd;
-                }
-                QTabBar::tab {
-                    background-color: #eee;
-                    padding: 8px 12px;
-                    margin-right: 2px;
-                }
-                QTabBar::tab:selected {
-                    background-color: #4CAF50;
-                    color: white;
-                }
-                QProgressBar {
-                    border: 1px solid #ddd;
-                    border-radius: 4px;
-                    text-align: center;
-                }
-                QProgressBar::chunk {
-                    background-color: #4CAF50;
-                    width: 1px;
-                }
-            """)
+            palette = _dark_palette()
+            if app.palette() != palette:
+                app.setPalette(palette)
+                
+        # The stylesheet only keeps what the palette cannot express. Apply it
+        # once for the whole application; setting an identical stylesheet
+        # again would still make Qt re-parse and re-polish it
+        qss = _theme_stylesheet(self.is_dark_mode)
+        if app.styleSheet() != qss:
+            app.setStyleSheet(qss)
 
     def _create_ui(self):
         """Create the user interface components."""
@@ -183,17 +194,21 @@ class FileProcessorWindow(QMainWindow):
         self.tabWidget = QTabWidget()
         main_layout.addWidget(self.tabWidget)
         
-        # Create tabs for tag removal and attribute cleaning
+        # Create tabs for tag removal and attribute cleaning. The attribute
+        # tab starts as an empty page and is filled when first shown
         self._create_tag_removal_tab()
-        self._create_attribute_cleaning_tab()
+        self.clean_tab = QWidget()
+        self.attribute_tab_built = False
+        self.tabWidget.addTab(self.clean_tab, "Tags to Clean Attributes")
+        self.tabWidget.currentChanged.connect(self._ensure_attribute_tab)
         
         # Progress bar
         self._create_progress_section(main_layout)
         
         # Start button
-        start_button = QPushButton("Start Processing")
-        start_button.clicked.connect(self.start_processing)
-        main_layout.addWidget(start_button)
+        self.start_button = QPushButton("Start Processing")
+        self.start_button.clicked.connect(self.start_processing)
+        main_layout.addWidget(self.start_button)
         
         # Add author label at the bottom
         main_layout.addWidget(self.author_label)
@@ -205,13 +220,24 @@ class FileProcessorWindow(QMainWindow):
         
         # Path input with drag and drop
         path_layout = QHBoxLayout()
-        self.path_input = DragDropLineEdit()
+        self.path_input = DragDropListView()
         self.path_input.setPlaceholderText("Drag and drop files/folders here or use Browse button...")
+        self.path_input.setMaximumHeight(100)
+        self.path_input.pathsDropped.connect(self._on_paths_dropped)
+        self.input_paths = []
         browse_button = QPushButton("Browse")
         browse_button.clicked.connect(self.browse_paths)
+        remove_path_button = QPushButton("Remove Selected")
+        remove_path_button.clicked.connect(self.path_input.remove_selected_paths)
+        remove_path_button.setObjectName("removeButton")
+        
+        path_buttons_layout = QVBoxLayout()
+        path_buttons_layout.addWidget(browse_button)
+        path_buttons_layout.addWidget(remove_path_button)
+        path_buttons_layout.addStretch()
         
         path_layout.addWidget(self.path_input)
-        path_layout.addWidget(browse_button)
+        path_layout.addLayout(path_buttons_layout)
         input_layout.addLayout(path_layout)
         
         # File type selection
@@ -231,6 +257,16 @@ class FileProcessorWindow(QMainWindow):
         self.recursive_checkbox = QCheckBox("Process subfolders recursively")
         input_layout.addWidget(self.recursive_checkbox)
         
+        # Opt-in, as cached results take disk space and are kept between runs
+        cache_layout = QHBoxLayout()
+        self.cache_checkbox = QCheckBox("Reuse results for files processed before")
+        clear_cache_button = QPushButton("Clear Cache")
+        clear_cache_button.clicked.connect(self.clear_cache)
+        cache_layout.addWidget(self.cache_checkbox)
+        cache_layout.addStretch()
+        cache_layout.addWidget(clear_cache_button)
+        input_layout.addLayout(cache_layout)
+        
         main_layout.addWidget(input_group)
 
     def _create_tag_removal_tab(self):
@@ -242,19 +278,19 @@ class FileProcessorWindow(QMainWindow):
         # Instead add explanation text
         remove_layout.addWidget(QLabel("Select which tags to remove and how:"))
         
-        # Common HTML tags to remove
+        # Common HTML tags to remove; layout activation is suspended while rows are added
         common_tags_layout = QGridLayout()
+        common_tags_layout.setEnabled(False)
         
         self.removal_tag_checkboxes = {}
         self.removal_mode_checkboxes = {}  # Nowy słownik dla trybu usuwania
-        common_tags = ["script", "style", "iframe", "comment", "header", "footer", "nav", "aside"]
         
         # Create column headers
         common_tags_layout.addWidget(QLabel("Tag"), 0, 0)
         common_tags_layout.addWidget(QLabel("Remove"), 0, 1)
         common_tags_layout.addWidget(QLabel("With content"), 0, 2)
         
-        for i, tag in enumerate(common_tags):
+        for i, tag in enumerate(COMMON_REMOVAL_TAGS):
             row = i + 1  # Start from row 1 (after headers)
             
             # Tag name label
@@ -273,8 +309,9 @@ class FileProcessorWindow(QMainWindow):
             common_tags_layout.addWidget(mode_checkbox, row, 2)
             
             # Connect checkbox to enable/disable mode selection
-            checkbox.stateChanged.connect(lambda state, tag=tag: self.toggle_removal_mode(tag, state))
+            checkbox.stateChanged.connect(partial(self.toggle_removal_mode, tag))
         
+        common_tags_layout.setEnabled(True)
         remove_layout.addLayout(common_tags_layout)
         
         # Custom tags section stays mostly the same, but add mode selection
@@ -300,9 +337,12 @@ class FileProcessorWindow(QMainWindow):
         
         # List of custom removal tags (now with two columns: tag name and removal mode)
         self.removal_tags_list = QListWidget()
+        # Mirror of removal_tags_list (tag -> with_content) for O(1) duplicate
+        # checks and iteration without reading items back from the widget
+        self.custom_removal_tags = {}
         remove_tag_button = QPushButton("Remove Selected")
         remove_tag_button.clicked.connect(self.remove_removal_tag)
-        remove_tag_button.setStyleSheet("background-color: #e74c3c; color: white;")
+        remove_tag_button.setObjectName("removeButton")
         
         custom_tag_layout.addWidget(QLabel("Custom tags to remove:"))
         custom_tag_layout.addWidget(self.removal_tags_list)
@@ -312,10 +352,39 @@ class FileProcessorWindow(QMainWindow):
         
         self.tabWidget.addTab(remove_tab, "Tags to Remove")
 
+    def _ensure_attribute_tab(self, index):
+        """Build the attribute cleaning tab the first time it is shown."""
+        if index == self.tabWidget.indexOf(self.clean_tab) and not self.attribute_tab_built:
+            self._create_attribute_cleaning_tab()
+
+    def _build_tag_grid(self, tag_names, max_cols):
+        """
+        Build a grid of checkboxes, one per tag, filled row by row.
+        
+        Layout activation is suspended while the cells are added, so the grid
+        is laid out once instead of after every widget.
+        
+        Args:
+            tag_names: Tag names to create checkboxes for
+            max_cols: Number of checkboxes per row
+            
+        Returns:
+            tuple: (QGridLayout, dict mapping tag name to its QCheckBox)
+        """
+        grid = QGridLayout()
+        grid.setEnabled(False)
+        checkboxes = {}
+        for index, tag in enumerate(tag_names):
+            checkbox = QCheckBox(tag)
+            checkboxes[tag] = checkbox
+            grid.addWidget(checkbox, *divmod(index, max_cols))
+        grid.setEnabled(True)
+        return grid, checkboxes
+
     def _create_attribute_cleaning_tab(self):
-        """Create the tab for attribute cleaning options."""
-        clean_tab = QWidget()
-        clean_layout = QVBoxLayout(clean_tab)
+        """Fill the placeholder tab with the attribute cleaning options."""
+        self.attribute_tab_built = True
+        clean_layout = QVBoxLayout(self.clean_tab)
         
         # Mode selection for attribute cleaning
         mode_group = QGroupBox("Attribute Cleaning Mode")
@@ -332,10 +401,12 @@ class FileProcessorWindow(QMainWindow):
         mode_layout.addWidget(self.attr_mode_selected)
         mode_layout.addWidget(self.attr_mode_all_except)
         
-        # Connect signals
-        self.attr_mode_all.toggled.connect(self.toggle_tag_selection)
-        self.attr_mode_selected.toggled.connect(self.toggle_tag_selection)
-        self.attr_mode_all_except.toggled.connect(self.toggle_tag_selection)
+        # Group the modes so a change is reported once, not as two toggled signals
+        self.attr_mode_group = QButtonGroup(self)
+        self.attr_mode_group.addButton(self.attr_mode_all)
+        self.attr_mode_group.addButton(self.attr_mode_selected)
+        self.attr_mode_group.addButton(self.attr_mode_all_except)
+        self.attr_mode_group.buttonClicked.connect(self.toggle_tag_selection)
         
         clean_layout.addWidget(mode_group)
         
@@ -345,21 +416,7 @@ class FileProcessorWindow(QMainWindow):
         tag_selection_layout = QVBoxLayout(self.tag_selection_group)
         
         # Common tags for selection
-        common_tags_layout = QGridLayout()
-        common_tags = ["p", "div", "span", "a", "table", "tr", "td", "img", "h1", "h2", "h3", "ul", "ol", "li"]
-        self.tag_selection_checkboxes = {}
-        
-        row, col = 0, 0
-        max_cols = 5
-        for tag in common_tags:
-            checkbox = QCheckBox(tag)
-            self.tag_selection_checkboxes[tag] = checkbox
-            common_tags_layout.addWidget(checkbox, row, col)
-            col += 1
-            if col >= max_cols:
-                col = 0
-                row += 1
-        
+        common_tags_layout, self.tag_selection_checkboxes = self._build_tag_grid(COMMON_CLEAN_TAGS, 5)
         tag_selection_layout.addLayout(common_tags_layout)
         
         # Custom tags input - similar to first tab
@@ -377,17 +434,16 @@ class FileProcessorWindow(QMainWindow):
         
         # List of custom tags
         self.clean_tags_list = QListWidget()
+        self.clean_tag_set = set()  # Tag names in clean_tags_list, for O(1) duplicate checks
         remove_clean_button = QPushButton("Remove Selected")
         remove_clean_button.clicked.connect(self.remove_clean_tag)
-        remove_clean_button.setStyleSheet("background-color: #e74c3c; color: white;")
+        remove_clean_button.setObjectName("removeButton")
         
         tag_selection_layout.addWidget(QLabel("Custom tags:"))
         tag_selection_layout.addWidget(self.clean_tags_list)
         tag_selection_layout.addWidget(remove_clean_button)
         
         clean_layout.addWidget(self.tag_selection_group)
-        
-        self.tabWidget.addTab(clean_tab, "Tags to Clean Attributes")
 
     def _create_progress_section(self, main_layout):
         """Create the progress bar section."""
@@ -404,12 +460,29 @@ class FileProcessorWindow(QMainWindow):
     # Event handlers and utility methods
     def browse_paths(self):
         """Browse for files or folders."""
-        dialog = QFileDialog(self)
-        dialog.setFileMode(QFileDialog.ExistingFiles)
+        if self.browse_dialog is None:
+            self.browse_dialog = QFileDialog(self)
+            self.browse_dialog.setFileMode(QFileDialog.ExistingFiles)
+            
+        dialog = self.browse_dialog
         if dialog.exec_():
             paths = dialog.selectedFiles()
-            self.path_input.setText("; ".join(paths))
-            self.path_input.paths = paths
+            self.path_input.add_paths(paths)
+
+    def _on_paths_dropped(self, paths):
+        """Keep the dropped or browsed paths as the input for the next run."""
+        self.input_paths = paths
+
+    def clear_cache(self):
+        """Delete all cached results."""
+        try:
+            shutil.rmtree(_cache_dir())
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self.show_error(f"Could not clear the cache: {e}")
+            return
+        self.show_info("Cache cleared")
 
     def show_error(self, message):
         """Show an error message dialog."""
@@ -433,13 +506,11 @@ class FileProcessorWindow(QMainWindow):
         # Store actual data as tag_name|mode where mode is 1 for with_content, 0 for without
         item_data = f"{tag_input}|{1 if with_content else 0}"
         
-        # Get existing tags to avoid duplicates
-        existing_items = [self.removal_tags_list.item(i).text().split()[0] for i in range(self.removal_tags_list.count())]
-        
-        if tag_input not in existing_items:
+        if tag_input not in self.custom_removal_tags:
             item = QListWidgetItem(display_text)
             item.setData(Qt.UserRole, item_data)  # Store the actual data
             self.removal_tags_list.addItem(item)
+            self.custom_removal_tags[tag_input] = with_content
             self.removal_custom_input.clear()
             self.custom_tag_with_content.setChecked(False)
         else:
@@ -447,44 +518,53 @@ class FileProcessorWindow(QMainWindow):
         
     def remove_removal_tag(self):
         """Remove selected tag from the removal list."""
-        selected_items = self.removal_tags_list.selectedItems()
-        for item in selected_items:
-            self.removal_tags_list.takeItem(self.removal_tags_list.row(item))
+        # Take rows from the bottom up so the remaining indexes stay valid,
+        # repainting the list once at the end
+        self.removal_tags_list.setUpdatesEnabled(False)
+        for row in sorted((index.row() for index in self.removal_tags_list.selectedIndexes()), reverse=True):
+            item = self.removal_tags_list.takeItem(row)
+            self.custom_removal_tags.pop(item.data(Qt.UserRole).split('|')[0], None)
+        self.removal_tags_list.setUpdatesEnabled(True)
 
     def add_clean_tag(self):
         """Add custom tags to the attribute cleaning list."""
-        self._add_tags_to_list(self.clean_custom_input, self.clean_tags_list)
+        self._add_tags_to_list(self.clean_custom_input, self.clean_tags_list, self.clean_tag_set)
         
     def remove_clean_tag(self):
         """Remove selected tag from the attribute cleaning list."""
-        self._remove_selected_items(self.clean_tags_list)
+        self._remove_selected_items(self.clean_tags_list, self.clean_tag_set)
         
-    def _add_tags_to_list(self, input_field, list_widget):
-        """Helper method to add tags from input field to list widget."""
+    def _add_tags_to_list(self, input_field, list_widget, tag_set):
+        """Helper method to add tags from input field to list widget and its tag set."""
         tag_input = input_field.text().strip()
         if not tag_input:
             self.show_error("Please enter at least one tag name.")
             return
             
-        # Split by comma and process each tag
-        tag_list = [tag.strip() for tag in tag_input.split(',')]
-        
-        # Get existing tags to avoid duplicates
-        existing_items = [list_widget.item(i).text() for i in range(list_widget.count())]
+        # Tokenize and validate the input in one regex pass
+        tag_list = TAG_NAME_RE.findall(tag_input)
+        if not tag_list:
+            # Keep the input so it can be corrected
+            self.show_error("No valid tag names found. Tag names start with a letter.")
+            return
         
-        added_count = 0
+        new_tags = []
         duplicate_count = 0
         
         for tag in tag_list:
-            if not tag:  # Skip empty tags
-                continue
-                
-            if tag not in existing_items:
-                list_widget.addItem(tag)
-                added_count += 1
+            if tag not in tag_set:
+                new_tags.append(tag)
+                tag_set.add(tag)
             else:
                 duplicate_count += 1
                 
+        # Insert all new tags at once so the list repaints a single time
+        added_count = len(new_tags)
+        if new_tags:
+            list_widget.setUpdatesEnabled(False)
+            list_widget.addItems(new_tags)
+            list_widget.setUpdatesEnabled(True)
+                
         # Clear the input field
         input_field.clear()
         
@@ -494,40 +574,37 @@ class FileProcessorWindow(QMainWindow):
         elif added_count > 0 and len(tag_list) > 1:
             self.status_label.setText(f"Added {added_count} tags")
             
-    def _remove_selected_items(self, list_widget):
-        """Helper method to remove selected items from a list widget."""
-        selected_items = list_widget.selectedItems()
-        for item in selected_items:
-            list_widget.takeItem(list_widget.row(item))
+    def _remove_selected_items(self, list_widget, tag_set):
+        """Helper method to remove selected items from a list widget and its tag set."""
+        # Take rows from the bottom up so the remaining indexes stay valid,
+        # repainting the list once at the end
+        list_widget.setUpdatesEnabled(False)
+        for row in sorted((index.row() for index in list_widget.selectedIndexes()), reverse=True):
+            tag_set.discard(list_widget.takeItem(row).text())
+        list_widget.setUpdatesEnabled(True)
 
-    def toggle_tag_selection(self, checked):
+    def toggle_tag_selection(self, button):
         """Enable or disable tag selection based on selected mode."""
-        if checked:
-            # Enable tag selection only for 'selected' and 'all_except' modes
-            self.tag_selection_group.setEnabled(
-                self.attr_mode_selected.isChecked() or self.attr_mode_all_except.isChecked()
-            )
+        # Enable tag selection only for 'selected' and 'all_except' modes
+        self.tag_selection_group.setEnabled(
+            self.attr_mode_selected.isChecked() or self.attr_mode_all_except.isChecked()
+        )
             
-            # Update label based on selected mode
-            if self.attr_mode_selected.isChecked():
-                self.tag_selection_group.setTitle("Tags TO Clean (select tags)")
-            elif self.attr_mode_all_except.isChecked():
-                self.tag_selection_group.setTitle("Tags to EXCLUDE from Cleaning (select tags to keep)")
+        # Update label based on selected mode
+        if self.attr_mode_selected.isChecked():
+            self.tag_selection_group.setTitle("Tags TO Clean (select tags)")
+        elif self.attr_mode_all_except.isChecked():
+            self.tag_selection_group.setTitle("Tags to EXCLUDE from Cleaning (select tags to keep)")
     
     def get_selected_tags(self):
         """Get list of selected tags from checkboxes and list."""
-        selected_tags = []
-        
         # Get tags from checkboxes
-        for tag, checkbox in self.tag_selection_checkboxes.items():
-            if checkbox.isChecked():
-                selected_tags.append(tag)
-        
-        # Get custom tags from list
-        for i in range(self.clean_tags_list.count()):
-            tag = self.clean_tags_list.item(i).text()
-            if tag and tag not in selected_tags:
-                selected_tags.append(tag)
+        selected_tags = [tag for tag, checkbox in self.tag_selection_checkboxes.items() if checkbox.isChecked()]
+        
+        # Get custom tags from list in one call; they are unique and non-empty
+        checked_tags = set(selected_tags)
+        selected_tags.extend(item.text() for item in self.clean_tags_list.findItems("", Qt.MatchContains)
+                             if item.text() not in checked_tags)
                 
         return selected_tags
 
@@ -540,7 +617,7 @@ class FileProcessorWindow(QMainWindow):
     def start_processing(self):
         """Start processing the selected files."""
         # Validate input
-        paths = self.path_input.get_paths()
+        paths = self.input_paths
         if not paths:
             self.show_error("Please select at least one file or folder")
             return
@@ -548,50 +625,35 @@ class FileProcessorWindow(QMainWindow):
         recursive = self.recursive_checkbox.isChecked()
         
         # Get supported file extensions
-        supported_extensions = set()
-        if self.html_checkbox.isChecked():
-            supported_extensions.add('.html')
-        if self.txt_checkbox.isChecked():
-            supported_extensions.add('.txt')
+        supported_extensions = EXTENSIONS_BY_FILE_TYPES.get(
+            (self.html_checkbox.isChecked(), self.txt_checkbox.isChecked()))
             
         if not supported_extensions:
             self.show_error("Please select at least one file type to process")
             return
         
-        # Get tags to remove (split into two lists)
-        tags_to_remove = []
-        tags_to_remove_with_content = []
-        
-        # Add checked common tags for removal
-        for tag, checkbox in self.removal_tag_checkboxes.items():
-            if checkbox.isChecked():
-                if self.removal_mode_checkboxes[tag].isChecked():
-                    tags_to_remove_with_content.append(tag)
-                else:
-                    tags_to_remove.append(tag)
-                
-        # Add custom tags for removal
-        for i in range(self.removal_tags_list.count()):
-            item = self.removal_tags_list.item(i)
-            item_data = item.data(Qt.UserRole).split('|')
-            tag = item_data[0]
-            with_content = item_data[1] == '1'
-            
-            if with_content:
-                tags_to_remove_with_content.append(tag)
-            else:
-                tags_to_remove.append(tag)
+        # Get tags to remove: checked common tags, then custom tags, each
+        # paired with its "with content" flag and split into two lists
+        removal_tags = [(tag, self.removal_mode_checkboxes[tag].isChecked())
+                        for tag, checkbox in self.removal_tag_checkboxes.items() if checkbox.isChecked()]
+        removal_tags.extend(self.custom_removal_tags.items())
+        # dict.fromkeys drops tags both ticked and added as custom tags, keeping order
+        tags_to_remove = list(dict.fromkeys(tag for tag, with_content in removal_tags if not with_content))
+        tags_to_remove_with_content = list(dict.fromkeys(tag for tag, with_content in removal_tags if with_content))
             
-        # Determine attribute cleaning mode and exceptions
-        attr_clean_mode = 'all'  # Default
-        attr_exceptions = []
-        
-        if self.attr_mode_selected.isChecked():
+        # Determine attribute cleaning mode; an attribute tab that was never
+        # opened still holds its defaults
+        if not self.attribute_tab_built:
+            attr_clean_mode = 'all'  # Default
+        elif self.attr_mode_selected.isChecked():
             attr_clean_mode = 'selected'
-            attr_exceptions = self.get_selected_tags()
         elif self.attr_mode_all_except.isChecked():
             attr_clean_mode = 'all_except'
-            attr_exceptions = self.get_selected_tags()
+        else:
+            attr_clean_mode = 'all'  # Default
+            
+        # Read the selected tags once; they are reused for validation and processing
+        attr_exceptions = self.get_selected_tags() if attr_clean_mode != 'all' else []
         
         # Validate selections based on current tab
         current_tab_index = self.tabWidget.currentIndex()
@@ -612,47 +674,190 @@ class FileProcessorWindow(QMainWindow):
                     self.show_error("Please select at least one tag to exclude from cleaning")
                 return
         
-        # Get all files to process
-        files = get_all_files(paths, recursive, supported_extensions)
-        
-        total_files = len(files)
+        # Output directory, created as files are queued. Paths from the scanner
+        # are always relative, so plain concatenation replaces os.path.join
+        output_dir = os.path.join(os.path.dirname(os.path.normpath(paths[0])), "processed")
+        self.output_prefix = output_dir + os.sep
+        self.created_dirs = set()
+        
+        # Initialize progress tracking; the total is unknown until scanning ends
+        self.job_options = (tags_to_remove, tags_to_remove_with_content, attr_clean_mode, attr_exceptions)
+        self.total_files = 0
+        self.scan_done = False
+        self.progress_counter.reset()
+        self.last_progress = None
+        self.last_percent = -1
+        self.run_errors = []
+        self.progress_bar.setMaximum(0)
+        self.progress_bar.setValue(0)
+        self.start_button.setEnabled(False)
         
-        if total_files == 0:
+        if self.executor is None:
+            self.executor = self._create_executor()
+            
+        self.job_cache_dir = None
+        if self.cache_checkbox.isChecked():
+            try:
+                cache_dir = _cache_dir()
+                os.makedirs(cache_dir, exist_ok=True)
+            except OSError as e:
+                # Process without the cache; the error is reported with the others
+                self._collect_error(f"Result cache disabled: {e}")
+            else:
+                self.job_cache_dir = cache_dir
+                # Prune in a worker, ahead of the run's chunks
+                future = self._submit(prune_cache, cache_dir, CACHE_MAX_BYTES)
+                future.add_done_callback(partial(report_prune, self.process_signals))
+        
+        # Scan for files in the background and start processing each batch as it arrives
+        self.scanner = FileScanner(paths, recursive, supported_extensions, self)
+        self.scanner.files_found.connect(self._queue_files)
+        self.scanner.error.connect(self._collect_error)
+        self.scanner.finished.connect(self._on_scan_finished)
+        self.scanner.start()
+        
+        self.progress_timer.start()
+
+    def _queue_files(self, files):
+        """Submit a batch of found files as chunked jobs to the process pool."""
+        # Batches queued before the window closed may still arrive
+        if self.executor is None:
+            return
+            
+        # Create output paths preserving directory structure
+        outputs = [(input_path, self.output_prefix + rel_path, rel_path) for input_path, rel_path in files]
+        
+        # Create each new output folder of the batch once, before any job is submitted
+        new_dirs = {os.path.dirname(output_path) for _, output_path, _ in outputs} - self.created_dirs
+        for output_subdir in new_dirs:
+            os.makedirs(output_subdir, exist_ok=True)
+        self.created_dirs |= new_dirs
+            
+        # Hand files to the pool in chunks to keep per-job overhead low
+        for start in range(0, len(outputs), JOB_CHUNK_SIZE):
+            self._submit_chunk(outputs[start:start + JOB_CHUNK_SIZE])
+                                  
+        self.total_files += len(files)
+
+    def _create_executor(self):
+        """Create the process pool used for all runs of this window."""
+        # Parsing is CPU-bound, so run it in worker processes to avoid the GIL.
+        # Spawn instead of fork: forking a process that runs Qt threads is unsafe
+        # Size the pool from the CPUs this process may run on, which can be
+        # fewer than os.cpu_count() under taskset or container limits
+        if hasattr(os, 'sched_getaffinity'):
+            workers = len(os.sched_getaffinity(0))
+        else:
+            workers = os.cpu_count() or 1
+        # ProcessPoolExecutor rejects more than 61 workers on Windows
+        if sys.platform == 'win32':
+            workers = min(workers, 61)
+        return ProcessPoolExecutor(max_workers=workers,
+                                   mp_context=multiprocessing.get_context('spawn'))
+
+    def _submit(self, fn, *args):
+        """Submit a job to the process pool, replacing the pool if it is broken."""
+        try:
+            return self.executor.submit(fn, *args)
+        except BrokenProcessPool:
+            # A worker process died earlier; replace the pool and retry
+            self.executor = self._create_executor()
+            return self.executor.submit(fn, *args)
+
+    def _submit_chunk(self, chunk):
+        """Submit one chunk of files to the process pool."""
+        future = self._submit(process_chunk, chunk, self.job_options, self.job_cache_dir)
+        future.add_done_callback(partial(report_chunk, self.process_signals, self.progress_counter, len(chunk)))
+
+    def _collect_error(self, message):
+        """Keep an error from the scanner or a worker until the run ends."""
+        self.run_errors.append(message)
+
+    def _report_errors(self):
+        """Show the errors collected during the run in a single dialog."""
+        if not self.run_errors:
+            return
+            
+        # A modal dialog per failed file would stack up and run nested event
+        # loops while processing continues, so list them once at the end
+        message = "\n".join(self.run_errors[:MAX_REPORTED_ERRORS])
+        if len(self.run_errors) > MAX_REPORTED_ERRORS:
+            message += f"\n... and {len(self.run_errors) - MAX_REPORTED_ERRORS} more"
+        self.show_error(message)
+
+    def _on_scan_finished(self):
+        """Fix the progress range once all files are known."""
+        self.scan_done = True
+        self.scanner.deleteLater()
+        self.scanner = None
+        
+        if self.total_files == 0:
+            self._finish_processing()
+            self._report_errors()
             self.show_info("No supported files found in selected paths")
             return
 
-        # Create output directory
-        output_dir = os.path.join(os.path.dirname(paths[0]), "processed")
-        os.makedirs(output_dir, exist_ok=True)
+        self.progress_bar.setMaximum(self.total_files)
 
-        # Initialize progress tracking
-        processed = 0
-        errors = 0
-        self.progress_bar.setMaximum(total_files)
-        self.progress_bar.setValue(0)
+    def _flush_progress(self):
+        """Update progress from the shared counter and report when the batch is done."""
+        processed, errors = self.progress_counter.snapshot()
 
-        # Process each file
-        for input_path, rel_path in files:
-            # Create output path preserving directory structure
-            output_path = os.path.join(output_dir, rel_path)
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        # Skip ticks where nothing changed, so idle ticks do not touch the widgets
+        state = (processed, self.total_files, self.scan_done)
+        if state == self.last_progress:
+            return
+        self.last_progress = state
+        
+        if not self.scan_done:
+            self.status_label.setText(f"Scanning: {self.total_files} files found, {processed} processed")
+            return
             
-            result = process_html_file(input_path, output_path, 
-                                      tags_to_remove, tags_to_remove_with_content,
-                                      attr_clean_mode, attr_exceptions)
+        # Repaint the bar (and its styled chunk) only when the percentage moves
+        percent = processed * 100 // self.total_files
+        if percent != self.last_percent:
+            self.progress_bar.setValue(processed)
+            self.last_percent = percent
+        self.status_label.setText(f"Processing: {processed}/{self.total_files}")
             
-            if result is not True:
-                self.show_error(f"Error processing {rel_path}: {result}")
-                errors += 1
+        if processed < self.total_files:
+            return
             
-            processed += 1
-            self.progress_bar.setValue(processed)
-            self.status_label.setText(f"Processing: {processed}/{total_files}")
-            QApplication.processEvents()
+        self._finish_processing()
+        self._report_errors()
 
         # Show completion message
         success_count = processed - errors
         self.show_info(f"Processed {success_count} files successfully" + 
                       (f", {errors} errors" if errors > 0 else ""))
+
+    def closeEvent(self, event):
+        """Stop the scanner and the worker processes when the window closes."""
+        self.progress_timer.stop()
+        
+        if self.scanner is not None:
+            # No more batches or end-of-scan reports for a closed window
+            self.scanner.files_found.disconnect(self._queue_files)
+            self.scanner.finished.disconnect(self._on_scan_finished)
+            self.scanner.requestInterruption()
+            self.scanner.wait()
+            
+        if self.executor is not None:
+            # Drop the chunks that have not started yet (Python 3.9+);
+            # otherwise they would all run before the application exits.
+            # Waiting keeps the executor alive until the pending chunks are
+            # cancelled, and only lasts as long as the chunks already running
+            if sys.version_info >= (3, 9):
+                self.executor.shutdown(wait=True, cancel_futures=True)
+            else:
+                self.executor.shutdown(wait=False)
+            self.executor = None
+        super().closeEvent(event)
+
+    def _finish_processing(self):
+        """Reset the progress widgets and allow a new run."""
+        self.progress_timer.stop()
         self.status_label.setText("Ready")
-        self.progress_bar.setValue(0) 
\ No newline at end of file
+        self.progress_bar.setMaximum(100)
+        self.progress_bar.setValue(0)
+        self.start_button.setEnabled(True)
\ No newline at end of file
@@ -0,0 +1,138 @@
+"""
+Background Workers
+File scanning and progress reporting that run off the GUI thread
+"""
+
+import threading
+import time
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+
+from utils.file_utils import iter_files
+
+class ProcessSignals(QObject):
+    """Signals emitted by processing jobs, delivered to the GUI thread."""
+    error = pyqtSignal(str)
+
+class ProgressCounter:
+    """Thread-safe count of finished and failed jobs, polled by the GUI."""
+
+    def __init__(self):
+        """Initialize an empty counter."""
+        self._lock = threading.Lock()
+        self.processed = 0
+        self.errors = 0
+
+    def reset(self):
+        """Reset the counter before a new batch."""
+        with self._lock:
+            self.processed = 0
+            self.errors = 0
+
+    def add(self, processed, errors=0):
+        """Record a number of finished files, some of which may have failed."""
+        with self._lock:
+            self.processed += processed
+            self.errors += errors
+
+    def snapshot(self):
+        """
+        Read the counter.
+        
+        Returns:
+            tuple: (processed, errors)
+        """
+        with self._lock:
+            return self.processed, self.errors
+
+def report_chunk(signals, counter, size, future):
+    """
+    Done-callback for a processors.batch.process_chunk future.
+    
+    Runs in the executor's thread, so it only touches the thread-safe
+    counter and emits queued signals to the GUI.
+        
+    Args:
+        signals: Shared ProcessSignals instance used to report errors
+        counter: Shared ProgressCounter updated with the chunk result
+        size: Number of files in the chunk
+        future: The finished future
+    """
+    # Chunks cancelled when the window closes have nothing to report
+    if future.cancelled():
+        return
+        
+    try:
+        errors = future.result()
+    except Exception as e:
+        # The whole chunk is lost if the worker process died or was cancelled
+        signals.error.emit(f"Error processing files: {e}")
+        counter.add(size, size)
+        return
+
+    for message in errors:
+        signals.error.emit(message)
+    counter.add(size, len(errors))
+
+def report_prune(signals, future):
+    """
+    Done-callback for a processors.batch.prune_cache future.
+    
+    Args:
+        signals: Shared ProcessSignals instance used to report errors
+        future: The finished future
+    """
+    if future.cancelled():
+        return
+        
+    error = future.exception()
+    if error is not None:
+        # The run goes on with the cache as it is
+        signals.error.emit(f"Could not prune the result cache: {error}")
+
+class FileScanner(QThread):
+    """Enumerate input files in a background thread, emitting them in batches."""
+    files_found = pyqtSignal(list)
+    error = pyqtSignal(str)
+    
+    BATCH_SIZE = 256
+    BATCH_INTERVAL = 0.05  # Seconds before a partial batch is sent anyway
+
+    def __init__(self, paths, recursive, supported_extensions, parent=None):
+        """
+        Initialize the scanner.
+        
+        Args:
+            paths: List of file or directory paths
+            recursive: Whether to search directories recursively
+            supported_extensions: Tuple of file extensions to include
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.paths = paths
+        self.recursive = recursive
+        self.supported_extensions = supported_extensions
+
+    def run(self):
+        """Walk the paths and emit (full_path, relative_path) batches as they are found."""
+        batch = []
+        last_emit = time.monotonic()
+        # Walk each input on its own, so an unreadable folder is reported
+        # without ending the scan of the inputs after it
+        for path in self.paths:
+            try:
+                for item in iter_files([path], self.recursive, self.supported_extensions):
+                    # Stop early when the window is closing
+                    if self.isInterruptionRequested():
+                        return
+                    batch.append(item)
+                    # Send full batches, and partial ones on slow walks so the
+                    # first files start processing before the scan finishes
+                    if len(batch) >= self.BATCH_SIZE or time.monotonic() - last_emit >= self.BATCH_INTERVAL:
+                        self.files_found.emit(batch)
+                        batch = []
+                        last_emit = time.monotonic()
+            except OSError as e:
+                self.error.emit(f"Error scanning files: {e}")
+            
+        if batch:
+            self.files_found.emit(batch)
@@ -5,11 +5,16 @@ Author: Piotr Proszowski
 """
 
 import sys
-from PyQt5.QtWidgets import QApplication
-from gui.main_window import FileProcessorWindow
 
 def main():
+    # Imported here rather than at the top: worker processes are spawned and
+    # re-import this module, and they don't need Qt
+    from PyQt5.QtWidgets import QApplication
+    from gui.main_window import FileProcessorWindow
+
     app = QApplication(sys.argv)
+    # Names the per-user folders Qt reports, such as the result cache location
+    app.setApplicationName("html_cleaner")
     window = FileProcessorWindow()
     window.show()
     sys.exit(app.exec_())
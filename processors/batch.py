@@ -0,0 +1,63 @@
+"""
+Batch Processing
+Runs chunks of files through the HTML processor in worker processes
+"""
+
+import os
+
+# Kept free of Qt imports: the pool unpickles process_chunk by importing this
+# module in every worker process
+
+def process_chunk(files, options, cache_dir=None):
+    """
+    Process a chunk of files in a worker process.
+
+    Args:
+        files: List of tuples (input_path, output_path, rel_path)
+        options: Remaining arguments passed to process_html_file
+        cache_dir: Folder of cached results, or None to process every file
+        
+    Returns:
+        list: Error messages for the files that failed
+    """
+    # Imported here so BeautifulSoup is only loaded by the worker processes,
+    # not by the GUI at startup
+    from processors.html_processor import prepare_tag_sets, process_html_file
+    
+    # The tag sets are the same for every file of the batch
+    tag_sets = prepare_tag_sets(options[0], options[1])
+    
+    errors = []
+    for input_path, output_path, rel_path in files:
+        result = process_html_file(input_path, output_path, *options, tag_sets=tag_sets, cache_dir=cache_dir)
+        if result is not True:
+            errors.append(f"Error processing {rel_path}: {result}")
+    return errors
+
+def prune_cache(cache_dir, max_bytes):
+    """
+    Delete the least recently used cached results beyond a size limit.
+    
+    Args:
+        cache_dir: Folder of cached results
+        max_bytes: Total size the cache may keep
+    """
+    entries = []
+    total = 0
+    with os.scandir(cache_dir) as it:
+        for entry in it:
+            if entry.is_file():
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+                
+    # Oldest first; results are touched whenever they are reused
+    entries.sort()
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
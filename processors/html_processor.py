@@ -3,74 +3,307 @@ HTML Processing Module
 Handles the actual HTML modification using BeautifulSoup
 """
 
+import hashlib
 import os
-from bs4 import BeautifulSoup, Comment
+import shutil
+from bs4 import BeautifulSoup, Comment, Tag, __version__ as BS4_VERSION
 
-def process_html_file(input_path, output_path, tags_to_remove, tags_to_remove_with_content, clean_attrs_mode, attrs_exceptions=None):
+try:
+    from lxml import etree
+    DOCUMENT_PARSER = 'lxml'
+    # lxml and libxml2 upgrades can change the parsed tree, so both are part of cache keys
+    PARSER_VERSION = (etree.LXML_VERSION, etree.LIBXML_VERSION)
+except ImportError:
+    DOCUMENT_PARSER = 'html.parser'
+    PARSER_VERSION = None
+
+# Buffer size for reading input and writing output files
+IO_BUFFER_SIZE = 1 << 20
+
+# Line ending a text-mode write would produce (\r\n on Windows)
+LINE_SEPARATOR = os.linesep.encode('ascii')
+
+# libxml2 drops attribute values and comments of 10 MB or more of UTF-8,
+# unless its huge tree option also turns off its other safety limits
+LXML_MAX_SIZE = 10_000_000
+
+# Part of every cache key; bump it when a change to the cleaner alters its
+# output, so results cached by older versions are not reused
+CACHE_VERSION = 2
+
+def _native_newlines(data):
+    """Turn LF line endings into the platform's, as writing in text mode does."""
+    if LINE_SEPARATOR != b'\n':
+        return data.replace(b'\n', LINE_SEPARATOR)
+    return data
+
+def choose_parser(content):
+    """
+    Pick the BeautifulSoup parser for the given content.
+    
+    Complete documents go to lxml, which builds the tree in C. Fragments and
+    plain text keep html.parser, because lxml would wrap them in <html><body>.
+    So do documents big enough to hold a value that libxml2 would drop.
+    
+    Args:
+        content: Text of the file to parse
+        
+    Returns:
+        str: Name of the parser to pass to BeautifulSoup
+    """
+    # A character takes up to 4 bytes in UTF-8; isascii() is a flag check
+    size = len(content) if content.isascii() else 4 * len(content)
+    if size >= LXML_MAX_SIZE:
+        return 'html.parser'
+    # Look at the start only, instead of copying the whole text to strip it
+    if content[:1024].lstrip()[:9].lower().startswith(('<!doctype', '<html')):
+        return DOCUMENT_PARSER
+    return 'html.parser'
+
+def is_plain_text(content):
+    """
+    Check whether text would come out of parsing and serializing unchanged.
+    
+    Without '<', '&' or '>' there is no markup and nothing the serializer
+    escapes. Whitespace-only text is excluded because the parser collapses it.
+    
+    Args:
+        content: Text of the file
+        
+    Returns:
+        bool: True if the file can be written out exactly as it was read
+    """
+    if '<' in content or '&' in content or '>' in content:
+        return False
+    return bool(content.strip(' \t\n\r\f'))
+
+def has_work(tags_to_remove, tags_to_remove_with_content, clean_attrs_mode, attrs_exceptions=None):
+    """
+    Check whether the options would change anything in a document.
+    
+    Args:
+        tags_to_remove: List of tags to remove (preserving content)
+        tags_to_remove_with_content: List of tags to remove including their content
+        clean_attrs_mode: Mode for cleaning attributes - 'all', 'selected', or 'all_except'
+        attrs_exceptions: List of tags to exclude or include for attribute cleaning (depends on clean_attrs_mode)
+        
+    Returns:
+        bool: False if processing would only re-serialize the document
+    """
+    if any(tags_to_remove) or any(tags_to_remove_with_content):
+        return True
+    if clean_attrs_mode == 'selected':
+        return any(attrs_exceptions or [])
+    return clean_attrs_mode in ('all', 'all_except')
+
+def cache_key(raw, tags_to_remove, tags_to_remove_with_content, clean_attrs_mode, attrs_exceptions=None):
+    """
+    Build the name of the cached result for a file and a set of options.
+    
+    Args:
+        raw: Bytes of the input file
+        tags_to_remove: List of tags to remove (preserving content)
+        tags_to_remove_with_content: List of tags to remove including their content
+        clean_attrs_mode: Mode for cleaning attributes - 'all', 'selected', or 'all_except'
+        attrs_exceptions: List of tags to exclude or include for attribute cleaning (depends on clean_attrs_mode)
+        
+    Returns:
+        str: Hex digest of the content and options
+    """
+    # The parser and its version are included, as both can change how the same input is serialized
+    options = (CACHE_VERSION, BS4_VERSION, DOCUMENT_PARSER, PARSER_VERSION, sorted(set(tags_to_remove)),
+               sorted(set(tags_to_remove_with_content)), clean_attrs_mode, sorted(set(attrs_exceptions or ())))
+    digest = hashlib.blake2b(repr(options).encode('utf-8'), digest_size=20)
+    digest.update(raw)
+    return digest.hexdigest()
+
+def _store_cached(cache_path, output):
+    """Save a result to the cache; failing to do so does not fail the file."""
+    # Write under a temporary name first so other workers never copy a partial file
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'wb', buffering=IO_BUFFER_SIZE) as file:
+            file.write(output)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        # Don't leave a partial temporary file behind
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+def _clean_all(name, exceptions):
+    """Attribute filter for the 'all' mode: clean every tag."""
+    return True
+
+def _clean_selected(name, exceptions):
+    """Attribute filter for the 'selected' mode: clean only the listed tags."""
+    return name in exceptions
+
+def _clean_all_except(name, exceptions):
+    """Attribute filter for the 'all_except' mode: clean all but the listed tags."""
+    return name not in exceptions
+
+def _clean_none(name, exceptions):
+    """Attribute filter for unknown modes: leave attributes alone."""
+    return False
+
+# Attribute filters by clean_attrs_mode, looked up once per document instead
+# of comparing the mode string at every tag
+ATTRIBUTE_FILTERS = {
+    'all': _clean_all,
+    'selected': _clean_selected,
+    'all_except': _clean_all_except,
+}
+
+def prepare_tag_sets(tags_to_remove, tags_to_remove_with_content):
+    """
+    Turn the tag lists into the sets used while cleaning a document.
+    
+    Args:
+        tags_to_remove: List of tags to remove (preserving content)
+        tags_to_remove_with_content: List of tags to remove including their content
+        
+    Returns:
+        tuple: (tags to unwrap, tags to decompose, whether to remove comments)
+    """
+    # 'comment' is a special case matching HTML comments rather than a tag name
+    remove_comments = 'comment' in tags_to_remove or 'comment' in tags_to_remove_with_content
+    unwrap_tags = frozenset(tags_to_remove) - {'comment', ''}
+    decompose_tags = frozenset(tags_to_remove_with_content) - {'comment', ''}
+    return unwrap_tags, decompose_tags, remove_comments
+
+def _next_outside(node):
+    """Return the node that follows the subtree of node in document order."""
+    while node is not None and node.next_sibling is None:
+        node = node.parent
+    return node.next_sibling if node is not None else None
+
+def clean_soup(soup, tag_sets, clean_attrs_mode, attrs_exceptions=None):
+    """
+    Remove tags, comments and attributes from a parsed document in a single walk.
+    
+    Tags are unwrapped before they would be removed with content, and the
+    subtree of a removed tag is skipped instead of being visited.
+    
+    Args:
+        soup: Parsed BeautifulSoup document, modified in place
+        tag_sets: Tag sets returned by prepare_tag_sets
+        clean_attrs_mode: Mode for cleaning attributes - 'all', 'selected', or 'all_except'
+        attrs_exceptions: List of tags to exclude or include for attribute cleaning (depends on clean_attrs_mode)
+    """
+    unwrap_tags, decompose_tags, remove_comments = tag_sets
+    exceptions = frozenset(attrs_exceptions or ())
+    should_clean = ATTRIBUTE_FILTERS.get(clean_attrs_mode, _clean_none)
+    
+    node = soup.contents[0] if soup.contents else None
+    while node is not None:
+        if isinstance(node, Tag):
+            name = node.name
+            if name in unwrap_tags:
+                # Remove tag but keep its content, which is visited next
+                next_node = node.next_element
+                node.unwrap()
+                node = next_node
+                continue
+                
+            if name in decompose_tags:
+                # Remove tag and its content
+                next_node = _next_outside(node)
+                node.decompose()
+                node = next_node
+                continue
+                
+            # Tags without attributes need neither the filter call nor a new dict
+            if node.attrs and should_clean(name, exceptions):
+                # Remove all attributes
+                node.attrs = {}
+                
+        elif remove_comments and isinstance(node, Comment):
+            next_node = node.next_element
+            node.extract()
+            node = next_node
+            continue
+            
+        node = node.next_element
+
+def process_html_file(input_path, output_path, tags_to_remove, tags_to_remove_with_content, clean_attrs_mode, attrs_exceptions=None, tag_sets=None, cache_dir=None):
     """
     Process HTML file by modifying specified tags using BeautifulSoup.
     
     Args:
         input_path: Path to the input file
-        output_path: Path where processed file will be saved
+        output_path: Path where processed file will be saved; its folder must already exist
         tags_to_remove: List of tags to remove (preserving content)
         tags_to_remove_with_content: List of tags to remove including their content
         clean_attrs_mode: Mode for cleaning attributes - 'all', 'selected', or 'all_except'
         attrs_exceptions: List of tags to exclude or include for attribute cleaning (depends on clean_attrs_mode)
+        tag_sets: prepare_tag_sets result for the same tags, to reuse it across a batch
+        cache_dir: Existing folder of earlier results to reuse and add to, or None to disable caching
     """
     try:
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        # Nothing to remove or clean: copy the file as is (sendfile on Linux)
+        # instead of building and serializing a tree
+        if not has_work(tags_to_remove, tags_to_remove_with_content, clean_attrs_mode, attrs_exceptions):
+            shutil.copyfile(input_path, output_path)
+            return True
+            
+        # Read the raw bytes in large chunks and decode them in one go, instead
+        # of going through a text-mode file's incremental decoder
+        with open(input_path, 'rb', buffering=IO_BUFFER_SIZE) as file:
+            raw = file.read()
+            
+        # Identical bytes cleaned with the same options give the same output
+        cache_path = None
+        if cache_dir is not None:
+            cache_path = os.path.join(cache_dir, cache_key(raw, tags_to_remove, tags_to_remove_with_content,
+                                                           clean_attrs_mode, attrs_exceptions))
+            try:
+                shutil.copyfile(cache_path, output_path)
+            except OSError:
+                # Not cached, or the cache can't be read: process the file
+                pass
+            else:
+                # Mark the result as recently used, so pruning removes older
+                # ones first; a result that can't be touched is still valid
+                try:
+                    os.utime(cache_path)
+                except OSError:
+                    pass
+                return True
+                
+        # Translate \r\n and \r to \n like a text-mode read does. Safe on the
+        # bytes, since \r never occurs inside a multi-byte UTF-8 sequence
+        if b'\r' in raw:
+            raw = raw.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+        content = raw.decode('utf-8')
         
-        with open(input_path, 'r', encoding='utf-8') as file:
-            content = file.read()
+        # Plain text files (usually the .txt inputs) have no tags to clean;
+        # write the bytes back instead of building a tree
+        if is_plain_text(content):
+            with open(output_path, 'wb', buffering=IO_BUFFER_SIZE) as file:
+                file.write(_native_newlines(raw))
+            return True
+        del raw
         
         # Parse the HTML content
-        soup = BeautifulSoup(content, 'html.parser')
-        
-        # Remove comments if specified (special case)
-        if 'comment' in tags_to_remove or 'comment' in tags_to_remove_with_content:
-            for comment in soup.find_all(text=lambda text: isinstance(text, Comment)):
-                comment.extract()
+        soup = BeautifulSoup(content, choose_parser(content))
+        # The tree holds everything from here on; don't keep the source text
+        # alive next to it and the serialized output
+        del content
         
-        # Process tags to remove while preserving content
-        for tag in tags_to_remove:
-            if tag and tag != 'comment':  # Skip empty tag names and 'comment'
-                for element in soup.find_all(tag):
-                    # Remove tag but keep its content
-                    element.unwrap()
+        if tag_sets is None:
+            tag_sets = prepare_tag_sets(tags_to_remove, tags_to_remove_with_content)
+        clean_soup(soup, tag_sets, clean_attrs_mode, attrs_exceptions)
         
-        # Process tags to remove with their content
-        for tag in tags_to_remove_with_content:
-            if tag and tag != 'comment':  # Skip empty tag names and 'comment'
-                for element in soup.find_all(tag):
-                    # Remove tag and its content
-                    element.decompose()
-        
-        # Process tags for attribute cleaning based on mode
-        if clean_attrs_mode == 'all':
-            # Clean all tags
-            for element in soup.find_all(True):  # Find all elements
-                # Remove all attributes
-                element.attrs = {}
-                    
-        elif clean_attrs_mode == 'selected':
-            # Clean only selected tags
-            for tag in attrs_exceptions or []:
-                if tag:  # Skip empty tag names
-                    for element in soup.find_all(tag):
-                        # Remove all attributes
-                        element.attrs = {}
-                            
-        elif clean_attrs_mode == 'all_except':
-            # Clean all tags except those in tags_to_exclude
-            for element in soup.find_all(True):
-                if element.name not in (attrs_exceptions or []):
-                    # Remove all attributes
-                    element.attrs = {}
-        
-        # Convert back to string and write to output file
-        with open(output_path, 'w', encoding='utf-8') as file:
-            file.write(str(soup))
+        # Encode straight to UTF-8 bytes instead of building a str and
+        # encoding it again in a text-mode file
+        output = _native_newlines(soup.encode('utf-8'))
+        with open(output_path, 'wb', buffering=IO_BUFFER_SIZE) as file:
+            file.write(output)
+            
+        if cache_path is not None:
+            _store_cached(cache_path, output)
             
         return True
     except Exception as e:
@@ -0,0 +1,3 @@
+"""
+Tests for HTML & Text File Processor
+"""
\ No newline at end of file
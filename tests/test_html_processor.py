@@ -0,0 +1,151 @@
+"""
+HTML Processor Tests
+Compare the single-walk cleaner with the original one pass per tag
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from itertools import product
+from unittest import mock
+
+from bs4 import BeautifulSoup, Comment
+
+from processors import html_processor
+from processors.html_processor import clean_soup, prepare_tag_sets, process_html_file
+
+DOCUMENTS = [
+    # Comments, scripts and attributes in a complete document
+    '<!DOCTYPE html>\n<html><head><title>T</title><script>var a = 1;</script></head>\n'
+    '<body class="main"><!-- note --><p id="p1" style="color: red">Text <b>bold</b> &amp; more</p>\n'
+    '<img src="a.png" alt="A"><br></body></html>\n',
+    # Nested tags of the same name, and removable tags inside each other
+    '<div id="outer"><div class="inner"><span title="s">a<span>b</span></span><!-- c --></div>\n'
+    '<section><div>c<b class="x">d</b></div></section></div>',
+    # A fragment with a comment inside a tag that gets unwrapped
+    '<p><span>one<!-- two --></span><i lang="en">three</i></p>',
+    # Plain text
+    'just some text\nover two lines\n',
+]
+
+OPTIONS = [
+    (['comment'], [], 'selected', []),
+    ([], ['comment'], 'selected', []),
+    (['div'], [], 'selected', []),
+    ([], ['div'], 'selected', []),
+    # Unwrap a tag around one that is removed with its content, and the reverse
+    (['div'], ['span'], 'selected', []),
+    (['span'], ['div'], 'selected', []),
+    # The same tag in both lists is unwrapped
+    (['span', 'comment'], ['span'], 'selected', []),
+    (['b'], ['script'], 'all', []),
+    ([], [], 'all', []),
+    ([], [], 'selected', ['p', 'span']),
+    ([], [], 'all_except', ['img', 'div']),
+    (['section'], [], 'all_except', []),
+]
+
+def reference_clean(soup, tags_to_remove, tags_to_remove_with_content, clean_attrs_mode, attrs_exceptions):
+    """Clean a document with one find_all pass per tag, as the processor originally did."""
+    if 'comment' in tags_to_remove or 'comment' in tags_to_remove_with_content:
+        for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
+            comment.extract()
+    for tag in tags_to_remove:
+        if tag and tag != 'comment':
+            for element in soup.find_all(tag):
+                element.unwrap()
+    for tag in tags_to_remove_with_content:
+        if tag and tag != 'comment':
+            for element in soup.find_all(tag):
+                element.decompose()
+    if clean_attrs_mode == 'all':
+        for element in soup.find_all(True):
+            element.attrs = {}
+    elif clean_attrs_mode == 'selected':
+        for tag in attrs_exceptions:
+            if tag:
+                for element in soup.find_all(tag):
+                    element.attrs = {}
+    elif clean_attrs_mode == 'all_except':
+        for element in soup.find_all(True):
+            if element.name not in attrs_exceptions:
+                element.attrs = {}
+
+def expected_output(content, options):
+    """Bytes the original processor wrote: html.parser, text-mode newlines."""
+    # A text-mode read turns \r\n and \r into \n, and a text-mode write turns
+    # \n into the platform's line ending
+    content = content.replace('\r\n', '\n').replace('\r', '\n')
+    soup = BeautifulSoup(content, 'html.parser')
+    reference_clean(soup, *options)
+    return str(soup).replace('\n', os.linesep).encode('utf-8')
+
+class CleanSoupTest(unittest.TestCase):
+    """clean_soup against the one-pass-per-tag reference."""
+
+    def test_matches_reference(self):
+        for content, options in product(DOCUMENTS, OPTIONS):
+            with self.subTest(content=content[:30], options=options):
+                tags_to_remove, tags_to_remove_with_content, mode, exceptions = options
+                expected = BeautifulSoup(content, 'html.parser')
+                reference_clean(expected, *options)
+                
+                soup = BeautifulSoup(content, 'html.parser')
+                clean_soup(soup, prepare_tag_sets(tags_to_remove, tags_to_remove_with_content), mode, exceptions)
+                self.assertEqual(str(soup), str(expected))
+
+class ProcessHtmlFileTest(unittest.TestCase):
+    """process_html_file output bytes against the original processor."""
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        # The original processor parsed everything with html.parser
+        patcher = mock.patch.object(html_processor, 'DOCUMENT_PARSER', 'html.parser')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def process(self, data, options):
+        """Run the processor on the given input bytes and return the output bytes."""
+        input_path = os.path.join(self.folder, 'input.html')
+        output_path = os.path.join(self.folder, 'output.html')
+        with open(input_path, 'wb') as file:
+            file.write(data)
+        self.assertIs(process_html_file(input_path, output_path, *options), True)
+        with open(output_path, 'rb') as file:
+            return file.read()
+
+    def test_matches_reference(self):
+        for content, options in product(DOCUMENTS, OPTIONS):
+            with self.subTest(content=content[:30], options=options):
+                self.assertEqual(self.process(content.encode('utf-8'), options),
+                                 expected_output(content, options))
+
+    def test_line_endings(self):
+        for newline, options in product(['\r\n', '\r'], OPTIONS):
+            content = DOCUMENTS[0].replace('\n', newline)
+            with self.subTest(newline=newline, options=options):
+                self.assertEqual(self.process(content.encode('utf-8'), options),
+                                 expected_output(content, options))
+
+    def test_plain_text(self):
+        for content in ['line one\r\nline two\rline three\n', 'no newline', 'é ü ☃\n']:
+            with self.subTest(content=content):
+                options = (['comment'], ['script'], 'all', [])
+                self.assertEqual(self.process(content.encode('utf-8'), options),
+                                 expected_output(content, options))
+
+    def test_copies_file_without_work(self):
+        data = b'<p class="a">&\r\n<br></p>'
+        self.assertEqual(self.process(data, ([], [], 'selected', [])), data)
+
+    def test_invalid_utf8_fails(self):
+        input_path = os.path.join(self.folder, 'input.html')
+        with open(input_path, 'wb') as file:
+            file.write(b'<p>\xff</p>')
+        result = process_html_file(input_path, os.path.join(self.folder, 'output.html'), ['p'], [], 'all')
+        self.assertIsInstance(result, str)
+
+if __name__ == '__main__':
+    unittest.main()
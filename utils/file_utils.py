@@ -11,50 +11,96 @@ def is_supported_file(filename, extensions):
     
     Args:
         filename: The name of the file to check
-        extensions: A set of supported extensions (e.g., {'.html', '.txt'})
+        extensions: A set of lower-case supported extensions (e.g., {'.html', '.txt'})
         
     Returns:
         bool: True if the file has a supported extension, False otherwise
     """
-    return os.path.splitext(filename)[1].lower() in extensions
+    # Same rule as os.path.splitext: a leading dot does not start an extension
+    name = os.path.basename(filename)
+    dot = name.rfind('.')
+    return dot > 0 and name[dot:].lower() in extensions
 
-def get_all_files(paths, recursive=False, supported_extensions=None):
+def _scan_directory(path, rel_dir, recursive, extensions):
     """
-    Get all supported files from the given paths.
+    Yield supported files from a directory using os.scandir.
+    
+    DirEntry caches the file type from the directory read, so unlike
+    os.listdir + os.path.isfile no extra stat is needed per entry.
+    Subfolders are walked from an explicit stack carrying their relative
+    path prefix, so deep trees need neither recursion nor os.path.join.
+    
+    Args:
+        path: Directory to scan
+        rel_dir: Relative path of the directory used to build output paths
+        recursive: Whether to descend into subdirectories
+        extensions: Frozenset of lower-case file extensions to include
+        
+    Yields:
+        tuple: (full_path, relative_path)
+    """
+    # An empty rel_dir (e.g. for a filesystem root) must not start paths with a separator
+    stack = [(path, rel_dir + os.sep if rel_dir else '')]
+    
+    while stack:
+        dir_path, rel_prefix = stack.pop()
+        subdirs = []
+    
+        try:
+            with os.scandir(dir_path) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        # Inlined is_supported_file; entry.name is already a base name
+                        name = entry.name
+                        dot = name.rfind('.')
+                        if dot > 0 and name[dot:].lower() in extensions:
+                            yield entry.path, rel_prefix + name
+                    elif recursive and entry.is_dir(follow_symlinks=False):
+                        subdirs.append((entry.path, rel_prefix + entry.name + os.sep))
+        except OSError:
+            if dir_path == path:
+                raise
+            # Skip unreadable subfolders, as os.walk does
+            continue
+            
+        # Descend after the directory handle is closed, like os.walk (top-down);
+        # reversed so subfolders are popped in directory order
+        stack.extend(reversed(subdirs))
+
+def iter_files(paths, recursive=False, supported_extensions=None):
+    """
+    Lazily yield all supported files from the given paths.
     
     Args:
         paths: List of file or directory paths
         recursive: Whether to search directories recursively
-        supported_extensions: Set of file extensions to include
+        supported_extensions: Collection of file extensions to include
         
-    Returns:
-        list: List of tuples (full_path, relative_path)
+    Yields:
+        tuple: (full_path, relative_path)
     """
-    if not supported_extensions:
-        supported_extensions = set()
+    # Lower-case frozenset built once for the membership checks in the walk
+    supported_extensions = frozenset(ext.lower() for ext in supported_extensions or ())
         
-    files = []
-    
     for path in paths:
         if os.path.isfile(path):
             if is_supported_file(path, supported_extensions):
                 # For single file, use the filename as relative path
-                filename = os.path.basename(path)
-                files.append((path, filename))
+                yield path, os.path.basename(path)
         elif os.path.isdir(path):
-            if recursive:
-                # Walk through all directories and subdirectories
-                for root, _, filenames in os.walk(path):
-                    for filename in filenames:
-                        if is_supported_file(filename, supported_extensions):
-                            full_path = os.path.join(root, filename)
-                            rel_path = os.path.relpath(full_path, path)
-                            files.append((full_path, os.path.join(os.path.basename(path), rel_path)))
-            else:
-                # Just process the files in the top directory
-                for filename in os.listdir(path):
-                    full_path = os.path.join(path, filename)
-                    if os.path.isfile(full_path) and is_supported_file(filename, supported_extensions):
-                        files.append((full_path, os.path.join(os.path.basename(path), filename)))
-                
-    return files 
\ No newline at end of file
+            # normpath drops a trailing separator, which would leave an empty basename
+            yield from _scan_directory(path, os.path.basename(os.path.normpath(path)), recursive, supported_extensions)
+
+def get_all_files(paths, recursive=False, supported_extensions=None):
+    """
+    Get all supported files from the given paths.
+    
+    Args:
+        paths: List of file or directory paths
+        recursive: Whether to search directories recursively
+        supported_extensions: Set of file extensions to include
+        
+    Returns:
+        list: List of tuples (full_path, relative_path)
+    """
+    return list(iter_files(paths, recursive, supported_extensions))